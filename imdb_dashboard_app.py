@@ -15,35 +15,311 @@
 
 # %%
 import streamlit as st
+import os
 import sqlite3
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import numpy as np # For numerical operations, e.g., handling inf/NaN for scatter plot scaling
+import polars as pl
+import altair as alt
+import numpy as np # For numerical operations, e.g., binning the rating histogram
+
+DB_PATH = "imdb_2024.db"
+PARQUET_PATH = "imdb_2024.parquet"
+TABLE_ROW_LIMIT = 1000 # Cap on rows fetched for the data table display
+SCATTER_MAX_POINTS = 5000 # Downsample the scatter beyond this many rows
+SCATTER_PER_GENRE = 200 # Per-genre cap used when downsampling
+
+# --- Data Access Layer (Polars lazy queries over a Parquet file) ---
+# The movies table lives in a columnar Parquet file scanned lazily with
+# Polars: each helper composes filter/group_by/top-k operations on the lazy
+# frame and collects only the small result it needs. Predicate and projection
+# pushdown mean the multithreaded reader never decodes columns or row groups
+# a query does not touch.
+
+
+@st.cache_resource
+def get_lazy_frame():
+    """
+    Returns a Polars lazy scan of the Parquet file, migrating the movies
+    table out of the legacy SQLite database on first run.
+    Uses st.cache_resource so the scan is set up once and reused across reruns.
+    """
+    if not os.path.exists(PARQUET_PATH):
+        conn = sqlite3.connect(DB_PATH)
+        pd.read_sql("SELECT * FROM movies", conn).to_parquet(PARQUET_PATH, compression='zstd')
+        conn.close()
+    return pl.scan_parquet(PARQUET_PATH)
 
-# Set a clean plotting style for Matplotlib/Seaborn for better aesthetics
-plt.style.use('ggplot')
-sns.set_palette('deep') # A good default color palette for charts
 
-# --- Data Loading (Cached for performance) ---
-@st.cache_data
-def load_data():
+def filter_expr(filters):
     """
-    Loads movie data from the SQLite database.
-    Uses st.cache_data to cache the data, so it's only loaded once across reruns.
+    Builds the Polars predicate for the four sidebar filters. The hashable
+    filters tuple (genres plus the three slider ranges) is assembled once per
+    rerun and threaded through every query helper and chart builder.
     """
+    selected_genres, rating_range, duration_range, vote_range = filters
+    return (
+        pl.col('genre').is_in(list(selected_genres))
+        & pl.col('rating').is_between(rating_range[0], rating_range[1])
+        & pl.col('duration_minutes').is_between(duration_range[0], duration_range[1])
+        & pl.col('voting_counts').is_between(vote_range[0], vote_range[1])
+    )
+
+
+@st.cache_data
+def get_genres():
+    """Returns the sorted list of distinct genres in the dataset."""
     try:
-        conn = sqlite3.connect("imdb_2024.db")
-        query = "SELECT * FROM movies"
-        df = pd.read_sql(query, conn)
-        conn.close()
-        return df
+        return (
+            get_lazy_frame()
+            .select(pl.col('genre').unique().sort())
+            .collect()['genre']
+            .to_list()
+        )
     except Exception as e:
-        st.error(f"Error loading data from 'imdb_2024.db': {e}")
-        return pd.DataFrame() # Return an empty DataFrame on error
+        st.error(f"Error loading data from '{PARQUET_PATH}': {e}")
+        return []
+
+
+@st.cache_data
+def get_total_count():
+    """Returns the total number of movies in the dataset."""
+    return get_lazy_frame().select(pl.len()).collect().item()
+
+
+@st.cache_data
+def get_genre_bounds():
+    """
+    Returns per-genre (min, max) bounds for rating, duration and votes,
+    computed once in a single group_by and cached. Slider bounds for any
+    genre selection then come from a tiny indexed lookup over #genres rows
+    instead of a rescan on every rerun.
+    """
+    df = (
+        get_lazy_frame()
+        .group_by('genre')
+        .agg(
+            rmin=pl.col('rating').min(), rmax=pl.col('rating').max(),
+            dmin=pl.col('duration_minutes').min(), dmax=pl.col('duration_minutes').max(),
+            vmin=pl.col('voting_counts').min(), vmax=pl.col('voting_counts').max(),
+        )
+        .collect()
+    )
+    return df.to_pandas().set_index('genre')
+
+
+def downcast_numerics(df):
+    """
+    Narrows the numeric columns to the smallest dtype that fits (float32
+    rating, unsigned ints for duration and votes). Every mask, comparison
+    and chart then moves half or a quarter of the bytes.
+    """
+    df['rating'] = df['rating'].astype('float32')
+    df['duration_minutes'] = pd.to_numeric(df['duration_minutes'], downcast='unsigned')
+    df['voting_counts'] = pd.to_numeric(df['voting_counts'], downcast='unsigned')
+    return df
+
+
+def as_genre_category(df):
+    """
+    Stores the genre column as a category dtype (one code per known genre),
+    so downstream isin/groupby/value_counts hash small integer codes instead
+    of Python strings and the column takes a fraction of the memory.
+    """
+    df['genre'] = df['genre'].astype(pd.CategoricalDtype(get_genres()))
+    return df
+
+
+@st.cache_data
+def get_filtered(filters):
+    """
+    Returns (table rows capped by the row limit, total match count). The
+    count is attached as a broadcast pl.len() column before the limit is
+    applied, so the predicate is evaluated in a single pass for both.
+    """
+    df = (
+        get_lazy_frame()
+        .filter(filter_expr(filters))
+        .with_columns(pl.len().alias('n_matched'))
+        .head(TABLE_ROW_LIMIT)
+        .collect()
+    )
+    count = int(df['n_matched'][0]) if df.height else 0
+    # Narrow the dtypes in Polars, then hand Streamlit an Arrow-backed frame:
+    # st.dataframe serializes to Arrow anyway, so this display path is
+    # zero-copy instead of a pandas-to-Arrow conversion per rerun.
+    table = (
+        df.drop('n_matched')
+        .with_columns(
+            pl.col('genre').cast(pl.Categorical),
+            pl.col('rating').cast(pl.Float32),
+            pl.col('duration_minutes').cast(pl.UInt16),
+            pl.col('voting_counts').cast(pl.UInt32),
+        )
+        .to_pandas(use_pyarrow_extension_array=True)
+    )
+    return table, count
+
+
+@st.cache_data
+def get_top_movies(filters, order_col, limit=10):
+    """Returns the top movies by the given column via a Polars top-k sort."""
+    assert order_col in ("rating", "voting_counts")
+    df = (
+        get_lazy_frame()
+        .filter(filter_expr(filters))
+        .sort(order_col, descending=True)
+        .head(int(limit))
+        .collect()
+    )
+    return downcast_numerics(df.to_pandas())
+
+
+@st.cache_data
+def get_genre_stats(filters):
+    """
+    Returns every per-genre statistic the charts need in a single group_by
+    pass: average duration, average votes, total votes, average rating and
+    movie count, as a DataFrame indexed by genre. One scan instead of one
+    per chart.
+    """
+    df = (
+        get_lazy_frame()
+        .filter(filter_expr(filters))
+        .group_by('genre')
+        .agg(
+            avg_duration=pl.col('duration_minutes').mean(),
+            avg_votes=pl.col('voting_counts').mean(),
+            total_votes=pl.col('voting_counts').sum(),
+            avg_rating=pl.col('rating').mean(),
+            n=pl.len(),
+        )
+        .collect()
+    )
+    return df.to_pandas().set_index('genre')
+
+
+@st.cache_data
+def get_genre_leaders(filters):
+    """
+    Returns the top-rated movie per genre: one descending sort, then the
+    first row seen per genre, so the table also comes out rating-ordered.
+    """
+    df = (
+        get_lazy_frame()
+        .filter(filter_expr(filters))
+        .select(['genre', 'movie_name', 'rating', 'voting_counts'])
+        .sort('rating', descending=True)
+        .group_by('genre', maintain_order=True)
+        .first()
+        .collect()
+    )
+    return df.to_pandas(use_pyarrow_extension_array=True) # Zero-copy into st.dataframe
+
+
+@st.cache_data
+def get_ratings(filters):
+    """Returns just the rating column of the filtered rows, for the histogram."""
+    return (
+        get_lazy_frame()
+        .filter(filter_expr(filters))
+        .select(pl.col('rating').cast(pl.Float32))
+        .collect()['rating']
+        .to_pandas()
+    )
+
+
+@st.cache_data
+def get_scatter_data(filters):
+    """Returns only the columns the scatter plot needs for the filtered rows."""
+    df = (
+        get_lazy_frame()
+        .filter(filter_expr(filters))
+        .select(['genre', 'rating', 'voting_counts', 'duration_minutes'])
+        .collect()
+    )
+    return as_genre_category(downcast_numerics(df.to_pandas()))
+
+
+@st.cache_data
+def get_duration_extremes(filters):
+    """Returns the (shortest, longest) movie rows for the filtered data."""
+    lf = get_lazy_frame().filter(filter_expr(filters))
+    shortest = lf.sort('duration_minutes').head(1).collect().to_pandas()
+    longest = lf.sort('duration_minutes', descending=True).head(1).collect().to_pandas()
+    return shortest, longest
+
+
+def chart_for(name, filters, builder, **kwargs):
+    """
+    Returns the named chart for the current filter state, rebuilding only
+    when the filters changed since the last rerun. The most recent chart
+    object lives in st.session_state, so an unchanged rerun skips even the
+    st.cache_data argument hashing and result deserialization.
+    """
+    key = (filters, tuple(sorted(kwargs.items())))
+    if st.session_state.get(f"{name}_key") != key:
+        st.session_state[f"{name}_key"] = key
+        st.session_state[f"{name}_chart"] = builder(filters, **kwargs)
+    return st.session_state[f"{name}_chart"]
+
+
+# --- Chart Builders (cached per filter combination) ---
+# Each builder is keyed on exactly the filter values its chart depends on.
+# When only one widget changes, Streamlit replays the unchanged charts from
+# cache instead of re-querying and re-rendering all of them. The bar and
+# scatter charts are Altair/Vega-Lite specs rendered client-side, so the
+# server ships a small JSON payload instead of rasterizing a PNG and
+# pan/zoom/hover cost no Python work at all.
+
+@st.cache_data(show_spinner=False)
+def build_top_movies_chart(filters, order_col):
+    """Horizontal bar chart of the top 10 movies by rating or voting counts."""
+    top_movies = get_top_movies(filters, order_col)
+    if order_col == 'rating':
+        title, xlabel, scheme = 'Top 10 Movies by IMDb Rating (Filtered Data)', 'Rating', 'viridis'
+    else:
+        title, xlabel, scheme = 'Top 10 Movies by Voting Counts (Filtered Data)', 'Voting Counts', 'cividis'
+    return (
+        alt.Chart(top_movies)
+        .mark_bar()
+        .encode(
+            x=alt.X(order_col, title=xlabel),
+            y=alt.Y('movie_name', sort='-x', title='Movie Name'),
+            color=alt.Color(order_col, scale=alt.Scale(scheme=scheme), legend=None),
+            tooltip=['movie_name', 'genre', 'rating', 'voting_counts', 'duration_minutes'],
+        )
+        .properties(title=title, height=300)
+    )
+
+
+@st.cache_data(show_spinner=False)
+def build_scatter_chart(filters):
+    """Scatter plot of rating vs. voting counts, colored by genre."""
+    scatter_df = get_scatter_data(filters)
+    # Stratified downsample for dense selections: shuffle once, then keep at
+    # most SCATTER_PER_GENRE points per genre, so every genre stays visible
+    # while the chart payload stays bounded no matter how wide the filters are.
+    if len(scatter_df) > SCATTER_MAX_POINTS:
+        scatter_df = (
+            scatter_df.sample(frac=1, random_state=0)
+            .groupby('genre', observed=True)
+            .head(SCATTER_PER_GENRE)
+        )
+    return (
+        alt.Chart(scatter_df)
+        .mark_circle(opacity=0.7)
+        .encode(
+            # Log scale for voting counts as values vary widely, making small counts hard to see
+            x=alt.X('voting_counts', scale=alt.Scale(type='log'), title='Voting Counts (Log Scale)'),
+            y=alt.Y('rating', scale=alt.Scale(zero=False), title='Rating'),
+            color=alt.Color('genre', title='Genre'),
+            size=alt.Size('duration_minutes', scale=alt.Scale(range=[20, 400]), title='Duration (min)'),
+            tooltip=['genre', 'rating', 'voting_counts', 'duration_minutes'],
+        )
+        .properties(title='Rating vs. Voting Counts (Filtered Data)', height=400)
+        .interactive() # Client-side pan/zoom with no Python rerun
+    )
 
-# Load the entire dataset
-movies_df = load_data()
 
 # --- Streamlit App Layout ---
 st.set_page_config(layout="wide", page_title="IMDb 2024 Movie Analysis")
@@ -51,252 +327,193 @@ st.set_page_config(layout="wide", page_title="IMDb 2024 Movie Analysis")
 st.title("🎬 IMDb 2024 Data Analysis and Visualizations")
 st.markdown("Explore insights from IMDb's 2024 movie list with interactive filters and dynamic charts.")
 
-if movies_df.empty:
+all_genres = get_genres()
+
+if not all_genres:
     st.warning("No movie data available to display. Please ensure your 'imdb_2024.db' database and 'movies' table are populated correctly from your data processing script.")
 else:
     # --- Interactive Filtering Functionality (Sidebar) ---
     st.sidebar.header("Filter Movies 📊")
     st.sidebar.markdown("Use the controls below to refine the dataset.")
 
-    # Ensure 'genre' column is string type for consistent filtering
-    movies_df['genre'] = movies_df['genre'].astype(str)
-
     # Genre filter: Allow users to filter movies within specific genres
-    all_genres = sorted(movies_df['genre'].unique().tolist())
     selected_genres = st.sidebar.multiselect(
         "Select Genre(s):",
         options=all_genres,
         default=all_genres # Select all by default
     )
 
-    # Apply genre filter first to make other slider ranges dynamic
-    filtered_df_genre = movies_df[movies_df['genre'].isin(selected_genres)].copy()
+    # Dynamic slider bounds: combine the precomputed per-genre bounds of the
+    # current selection instead of rescanning the table on every rerun
+    sel_bounds = get_genre_bounds().loc[selected_genres] if selected_genres else None
 
-    # Dynamic sliders for other filters based on the currently genre-filtered data
     # Ratings filter: Filter movies based on IMDb ratings (e.g., > 8.0)
-    if not filtered_df_genre.empty:
-        min_rating_val, max_rating_val = float(filtered_df_genre['rating'].min()), float(filtered_df_genre['rating'].max())
-        rating_range = st.sidebar.slider(
-            "Rating Range:",
-            min_value=min_rating_val,
-            max_value=max_rating_val,
-            value=(min_rating_val, max_rating_val),
-            step=0.1,
-            format="%.1f"
-        )
-    else: # Fallback if genre filter makes the DataFrame empty
+    if sel_bounds is not None and not sel_bounds.empty:
+        min_rating_val, max_rating_val = float(sel_bounds['rmin'].min()), float(sel_bounds['rmax'].max())
+    else: # Fallback if genre filter matches no rows
         min_rating_val, max_rating_val = 0.0, 10.0
-        rating_range = st.sidebar.slider("Rating Range:", min_value=min_rating_val, max_value=max_rating_val, value=(min_rating_val, max_rating_val), step=0.1, format="%.1f")
-
+    rating_range = st.sidebar.slider(
+        "Rating Range:",
+        min_value=min_rating_val,
+        max_value=max_rating_val,
+        value=(min_rating_val, max_rating_val),
+        step=0.1,
+        format="%.1f"
+    )
 
     # Duration (Hrs) filter: Filter movies based on their runtime (e.g., < 2 hrs, 2–3 hrs, > 3 hrs)
-    if not filtered_df_genre.empty:
-        min_duration_val, max_duration_val = int(filtered_df_genre['duration_minutes'].min()), int(filtered_df_genre['duration_minutes'].max())
-        duration_range = st.sidebar.slider(
-            "Duration (minutes):",
-            min_value=min_duration_val,
-            max_value=max_duration_val,
-            value=(min_duration_val, max_duration_val),
-            step=5 # Step by 5 minutes
-        )
+    if sel_bounds is not None and not sel_bounds.empty:
+        min_duration_val, max_duration_val = int(sel_bounds['dmin'].min()), int(sel_bounds['dmax'].max())
     else: # Fallback
         min_duration_val, max_duration_val = 0, 300 # Default max 5 hours
-        duration_range = st.sidebar.slider("Duration (minutes):", min_value=min_duration_val, max_value=max_duration_val, value=(min_duration_val, max_duration_val), step=5)
-
+    duration_range = st.sidebar.slider(
+        "Duration (minutes):",
+        min_value=min_duration_val,
+        max_value=max_duration_val,
+        value=(min_duration_val, max_duration_val),
+        step=5 # Step by 5 minutes
+    )
 
     # Voting Counts filter: Filter based on the number of votes received (e.g., > 10,000 votes)
-    if not filtered_df_genre.empty:
-        min_votes_val, max_votes_val = int(filtered_df_genre['voting_counts'].min()), int(filtered_df_genre['voting_counts'].max())
-        vote_range = st.sidebar.slider(
-            "Voting Counts:",
-            min_value=min_votes_val,
-            max_value=max_votes_val,
-            value=(min_votes_val, max_votes_val),
-            step=1000 # Step by 1000 votes
-        )
+    if sel_bounds is not None and not sel_bounds.empty:
+        min_votes_val, max_votes_val = int(sel_bounds['vmin'].min()), int(sel_bounds['vmax'].max())
     else: # Fallback
         min_votes_val, max_votes_val = 0, 1000000 # Default to 1M votes
-        vote_range = st.sidebar.slider("Voting Counts:", min_value=min_votes_val, max_value=max_votes_val, value=(min_votes_val, max_votes_val), step=1000)
-
+    vote_range = st.sidebar.slider(
+        "Voting Counts:",
+        min_value=min_votes_val,
+        max_value=max_votes_val,
+        value=(min_votes_val, max_votes_val),
+        step=1000 # Step by 1000 votes
+    )
 
-    # Apply all filters to create the final filtered DataFrame
-    # This also combines filtering options so users can apply multiple filters simultaneously
-    final_filtered_df = filtered_df_genre[
-        (filtered_df_genre['rating'] >= rating_range[0]) &
-        (filtered_df_genre['rating'] <= rating_range[1]) &
-        (filtered_df_genre['duration_minutes'] >= duration_range[0]) &
-        (filtered_df_genre['duration_minutes'] <= duration_range[1]) &
-        (filtered_df_genre['voting_counts'] >= vote_range[0]) &
-        (filtered_df_genre['voting_counts'] <= vote_range[1])
-    ].copy() # Use .copy() to avoid SettingWithCopyWarning with filtered data
+    # The four filters are combined into one hashable tuple, built once per
+    # rerun; every query and chart builder below shares it (and derives the
+    # Polars predicate from it), so users can apply multiple filters
+    # simultaneously without each consumer rebuilding the predicate
+    filters = (tuple(selected_genres), rating_range, duration_range, vote_range)
 
     # --- Display Filtered Results in a dynamic DataFrame ---
     st.header("Filtered Movie Data 🎥")
+    if selected_genres:
+        final_filtered_df, filtered_count = get_filtered(filters)
+    else:
+        final_filtered_df = pd.DataFrame()
+        filtered_count = 0
     st.dataframe(final_filtered_df)
-    st.write(f"Displaying {len(final_filtered_df)} movies matching your criteria (out of {len(movies_df)} total movies).")
+    st.write(f"Displaying {filtered_count} movies matching your criteria (out of {get_total_count()} total movies).")
 
-    if final_filtered_df.empty:
+    if filtered_count == 0:
         st.info("No movies match the selected filter criteria. Adjust your filters to see results.")
     else:
         st.header("Interactive Visualizations 📈")
 
-        # --- Top 10 Movies by Rating and Voting Counts ---
-        # Visualization 1a: Top 10 Movies by Rating
-        st.markdown("### Top 10 Movies by Rating")
-        top_rated_movies = final_filtered_df.sort_values(by='rating', ascending=False).head(10)
-        fig1, ax1 = plt.subplots(figsize=(10, 6))
-        sns.barplot(x='rating', y='movie_name', data=top_rated_movies, ax=ax1, palette='viridis')
-        ax1.set_title('Top 10 Movies by IMDb Rating (Filtered Data)')
-        ax1.set_xlabel('Rating')
-        ax1.set_ylabel('Movie Name')
-        plt.xticks(rotation=0) # Ensure x-axis labels are horizontal
-        plt.tight_layout()
-        st.pyplot(fig1)
-
-        # Visualization 1b: Top 10 Movies by Voting Counts
-        st.markdown("### Top 10 Movies by Voting Counts")
-        top_voted_movies = final_filtered_df.sort_values(by='voting_counts', ascending=False).head(10)
-        fig2, ax2 = plt.subplots(figsize=(10, 6))
-        sns.barplot(x='voting_counts', y='movie_name', data=top_voted_movies, ax=ax2, palette='cividis')
-        ax2.set_title('Top 10 Movies by Voting Counts (Filtered Data)')
-        ax2.set_xlabel('Voting Counts')
-        ax2.set_ylabel('Movie Name')
-        plt.xticks(rotation=0)
-        plt.tight_layout()
-        st.pyplot(fig2)
-
-        # --- Genre Distribution ---
-        # Plot the count of movies for each genre in a bar chart.
-        st.markdown("### Genre Distribution")
-        genre_counts = final_filtered_df['genre'].value_counts().sort_values(ascending=False)
-        fig3, ax3 = plt.subplots(figsize=(12, 7))
-        sns.barplot(x=genre_counts.index, y=genre_counts.values, ax=ax3, palette='coolwarm')
-        ax3.set_title('Distribution of Movies Across Genres (Filtered Data)')
-        ax3.set_xlabel('Genre')
-        ax3.set_ylabel('Number of Movies')
-        plt.xticks(rotation=45, ha='right')
-        plt.tight_layout()
-        st.pyplot(fig3)
-
-        # --- Average Duration by Genre ---
-        # Show the average movie duration per genre in a horizontal bar chart.
-        st.markdown("### Average Duration by Genre")
-        avg_duration_genre = final_filtered_df.groupby('genre')['duration_minutes'].mean().sort_values(ascending=False)
-        fig4, ax4 = plt.subplots(figsize=(12, 8))
-        sns.barplot(x=avg_duration_genre.values, y=avg_duration_genre.index, ax=ax4, palette='plasma')
-        ax4.set_title('Average Movie Duration by Genre (Minutes) (Filtered Data)')
-        ax4.set_xlabel('Average Duration (Minutes)')
-        ax4.set_ylabel('Genre')
-        plt.tight_layout()
-        st.pyplot(fig4)
-
-        # --- Voting Trends by Genre (Average Voting Counts) ---
-        # Visualize average voting counts across different genres.
-        st.markdown("### Average Voting Counts by Genre")
-        avg_votes_genre = final_filtered_df.groupby('genre')['voting_counts'].mean().sort_values(ascending=False)
-        fig5, ax5 = plt.subplots(figsize=(12, 8))
-        sns.barplot(x=avg_votes_genre.values, y=avg_votes_genre.index, ax=ax5, palette='magma')
-        ax5.set_title('Average Voting Counts by Genre (Filtered Data)')
-        ax5.set_xlabel('Average Voting Counts')
-        ax5.set_ylabel('Genre')
-        plt.tight_layout()
-        st.pyplot(fig5)
-
-        # --- Rating Distribution ---
-        # Display a histogram or boxplot of movie ratings.
-        st.markdown("### Rating Distribution")
-        fig6, ax6 = plt.subplots(figsize=(10, 6))
-        sns.histplot(final_filtered_df['rating'], kde=True, bins=10, ax=ax6, color='skyblue')
-        ax6.set_title('Distribution of IMDb Ratings (Filtered Data)')
-        ax6.set_xlabel('Rating')
-        ax6.set_ylabel('Number of Movies')
-        plt.tight_layout()
-        st.pyplot(fig6)
-
-        # --- Genre-Based Rating Leaders ---
-        # Highlight the top-rated movie for each genre in a table.
-        st.markdown("### Top-Rated Movie for Each Genre")
-        if not final_filtered_df.empty:
-            # Find the movie with the highest rating for each genre
-            idx = final_filtered_df.groupby('genre')['rating'].idxmax()
-            genre_rating_leaders = final_filtered_df.loc[idx][['genre', 'movie_name', 'rating', 'voting_counts']].reset_index(drop=True)
-            genre_rating_leaders = genre_rating_leaders.sort_values(by='rating', ascending=False)
-            st.dataframe(genre_rating_leaders)
-        else:
-            st.info("No data available to determine genre-based rating leaders.")
-
-        # --- Most Popular Genres by Voting ---
-        # Identify genres with the highest total voting counts in a pie chart.
-        st.markdown("### Most Popular Genres by Total Voting Counts")
-        # Group by genre and sum voting counts
-        total_votes_by_genre = final_filtered_df.groupby('genre')['voting_counts'].sum().sort_values(ascending=False)
-        
-        # Limit to top N genres for readability in pie chart, group others into 'Other'
-        top_n_genres_for_pie = 10 
-        if len(total_votes_by_genre) > top_n_genres_for_pie:
-            other_votes = total_votes_by_genre.iloc[top_n_genres_for_pie:].sum()
-            total_votes_by_genre = total_votes_by_genre.head(top_n_genres_for_pie)
+        # One spinner covers all chart work; combined with the cached
+        # builders and session-state keys above, an unchanged rerun replays
+        # every chart without recomputing anything.
+        with st.spinner("Rendering charts..."):
+            # --- Top 10 Movies by Rating and Voting Counts ---
+            # Visualization 1a: Top 10 Movies by Rating
+            st.markdown("### Top 10 Movies by Rating")
+            st.altair_chart(chart_for('top_rated', filters, build_top_movies_chart, order_col='rating'), use_container_width=True)
+
+            # Visualization 1b: Top 10 Movies by Voting Counts
+            st.markdown("### Top 10 Movies by Voting Counts")
+            st.altair_chart(chart_for('top_voted', filters, build_top_movies_chart, order_col='voting_counts'), use_container_width=True)
+
+            # The per-genre bar charts are simple enough for st.bar_chart: the
+            # payload is the ~20-row aggregate itself and rendering (plus hover
+            # tooltips) happens client-side with no custom chart spec to build.
+            genre_stats = get_genre_stats(filters)
+
+            # --- Genre Distribution ---
+            # Plot the count of movies for each genre in a bar chart.
+            st.markdown("### Genre Distribution")
+            st.bar_chart(genre_stats['n'].sort_values(ascending=False),
+                         x_label='Genre', y_label='Number of Movies')
+
+            # --- Average Duration by Genre ---
+            # Show the average movie duration per genre in a horizontal bar chart.
+            st.markdown("### Average Duration by Genre")
+            st.bar_chart(genre_stats['avg_duration'].sort_values(ascending=False),
+                         horizontal=True, x_label='Average Duration (Minutes)', y_label='Genre')
+
+            # --- Voting Trends by Genre (Average Voting Counts) ---
+            # Visualize average voting counts across different genres.
+            st.markdown("### Average Voting Counts by Genre")
+            st.bar_chart(genre_stats['avg_votes'].sort_values(ascending=False),
+                         horizontal=True, x_label='Average Voting Counts', y_label='Genre')
+
+            # --- Rating Distribution ---
+            # Display a histogram of movie ratings. Binning is one np.histogram
+            # pass over the cached rating column; the old seaborn KDE overlay
+            # cost O(grid points x N) per rerun for a smoothing the bars already
+            # convey, so it is dropped.
+            st.markdown("### Rating Distribution")
+            counts, edges = np.histogram(get_ratings(filters), bins=10)
+            st.bar_chart(pd.Series(counts, index=np.round(edges[:-1], 1)),
+                         x_label='Rating', y_label='Number of Movies')
+
+            # --- Genre-Based Rating Leaders ---
+            # Highlight the top-rated movie for each genre in a table.
+            st.markdown("### Top-Rated Movie for Each Genre")
+            genre_rating_leaders = get_genre_leaders(filters)
+            if not genre_rating_leaders.empty:
+                st.dataframe(genre_rating_leaders)
+            else:
+                st.info("No data available to determine genre-based rating leaders.")
+
+            # --- Most Popular Genres by Voting ---
+            # Identify genres with the highest total voting counts. A horizontal
+            # bar chart reads more accurately than the old pie and skips the
+            # per-wedge label and geometry layout entirely.
+            st.markdown("### Most Popular Genres by Total Voting Counts")
+            total_votes = genre_stats['total_votes']
+            # nlargest does a partial heap selection; 'Other' absorbs the rest
+            total_votes_by_genre = total_votes.nlargest(10)
+            other_votes = total_votes.sum() - total_votes_by_genre.sum()
             if other_votes > 0:
                 total_votes_by_genre['Other'] = other_votes
-
-        fig7, ax7 = plt.subplots(figsize=(10, 10))
-        # Use autopct for percentages, startangle for orientation, wedgeprops for borders
-        ax7.pie(total_votes_by_genre, labels=total_votes_by_genre.index, autopct='%1.1f%%', startangle=90, wedgeprops={'edgecolor': 'black'})
-        ax7.set_title('Distribution of Total Voting Counts by Genre (Filtered Data)')
-        ax7.axis('equal') # Equal aspect ratio ensures that pie is drawn as a circle.
-        plt.tight_layout()
-        st.pyplot(fig7)
-
-        # --- Duration Extremes ---
-        # Use a table or card display to show the shortest and longest movies.
-        st.markdown("### Duration Extremes: Shortest and Longest Movies")
-        if not final_filtered_df.empty:
-            shortest_movie = final_filtered_df.loc[final_filtered_df['duration_minutes'].idxmin()]
-            longest_movie = final_filtered_df.loc[final_filtered_df['duration_minutes'].idxmax()]
-
-            col_short, col_long = st.columns(2)
-            with col_short:
-                st.info("#### Shortest Movie 📉")
-                st.write(f"**Movie:** {shortest_movie['movie_name']}")
-                st.write(f"**Genre:** {shortest_movie['genre']}")
-                st.write(f"**Duration:** {shortest_movie['duration_minutes']} minutes")
-                st.write(f"**Rating:** {shortest_movie['rating']}")
-            with col_long:
-                st.warning("#### Longest Movie 📈")
-                st.write(f"**Movie:** {longest_movie['movie_name']}")
-                st.write(f"**Genre:** {longest_movie['genre']}")
-                st.write(f"**Duration:** {longest_movie['duration_minutes']} minutes")
-                st.write(f"**Rating:** {longest_movie['rating']}")
-        else:
-            st.info("No data available to determine duration extremes.")
-
-        # --- Ratings by Genre (Comparison) ---
-        # Compare the average ratings for each genre.
-        # While a heatmap is mentioned, for simple comparison of average ratings per genre, a bar chart is clearer.
-        # A heatmap would be more suitable if comparing ratings across two categorical variables (e.g., Genre vs. Decade).
-        st.markdown("### Average Ratings by Genre (Comparison)")
-        avg_ratings_genre = final_filtered_df.groupby('genre')['rating'].mean().sort_values(ascending=False)
-        fig9, ax9 = plt.subplots(figsize=(12, 8))
-        sns.barplot(x=avg_ratings_genre.values, y=avg_ratings_genre.index, ax=ax9, palette='cool_r') # 'cool_r' is a reversed coolwarm
-        ax9.set_title('Average Ratings by Genre (Filtered Data)')
-        ax9.set_xlabel('Average Rating')
-        ax9.set_ylabel('Genre')
-        plt.tight_layout()
-        st.pyplot(fig9)
-
-
-        # --- Correlation Analysis: Ratings vs. Voting Counts ---
-        # Analyze the relationship between ratings and voting counts using a scatter plot.
-        st.markdown("### Rating vs. Voting Counts (Correlation)")
-        fig10, ax10 = plt.subplots(figsize=(10, 6))
-        sns.scatterplot(x='voting_counts', y='rating', data=final_filtered_df, ax=ax10, hue='genre', size='duration_minutes', sizes=(20, 400), alpha=0.7)
-        ax10.set_title('Rating vs. Voting Counts (Filtered Data)')
-        ax10.set_xlabel('Voting Counts (Log Scale)')
-        ax10.set_ylabel('Rating')
-        ax10.set_xscale('log') # Use log scale for voting counts as values can vary widely, making small counts hard to see
-        plt.grid(True, which="both", ls="--", c='0.7')
-        plt.tight_layout()
-        st.pyplot(fig10)
+            st.bar_chart(total_votes_by_genre, horizontal=True,
+                         x_label='Total Voting Counts', y_label='Genre')
+
+            # --- Duration Extremes ---
+            # Use a table or card display to show the shortest and longest movies.
+            st.markdown("### Duration Extremes: Shortest and Longest Movies")
+            shortest_df, longest_df = get_duration_extremes(filters)
+            if not shortest_df.empty and not longest_df.empty:
+                shortest_movie = shortest_df.iloc[0]
+                longest_movie = longest_df.iloc[0]
+
+                col_short, col_long = st.columns(2)
+                with col_short:
+                    st.info("#### Shortest Movie 📉")
+                    st.write(f"**Movie:** {shortest_movie['movie_name']}")
+                    st.write(f"**Genre:** {shortest_movie['genre']}")
+                    st.write(f"**Duration:** {shortest_movie['duration_minutes']} minutes")
+                    st.write(f"**Rating:** {shortest_movie['rating']}")
+                with col_long:
+                    st.warning("#### Longest Movie 📈")
+                    st.write(f"**Movie:** {longest_movie['movie_name']}")
+                    st.write(f"**Genre:** {longest_movie['genre']}")
+                    st.write(f"**Duration:** {longest_movie['duration_minutes']} minutes")
+                    st.write(f"**Rating:** {longest_movie['rating']}")
+            else:
+                st.info("No data available to determine duration extremes.")
+
+            # --- Ratings by Genre (Comparison) ---
+            # Compare the average ratings for each genre.
+            # While a heatmap is mentioned, for simple comparison of average ratings per genre, a bar chart is clearer.
+            # A heatmap would be more suitable if comparing ratings across two categorical variables (e.g., Genre vs. Decade).
+            st.markdown("### Average Ratings by Genre (Comparison)")
+            st.bar_chart(genre_stats['avg_rating'].sort_values(ascending=False),
+                         horizontal=True, x_label='Average Rating', y_label='Genre')
+
+
+            # --- Correlation Analysis: Ratings vs. Voting Counts ---
+            # Analyze the relationship between ratings and voting counts using a scatter plot.
+            st.markdown("### Rating vs. Voting Counts (Correlation)")
+            st.altair_chart(chart_for('scatter', filters, build_scatter_chart), use_container_width=True)
 
 
 